@@ -4,6 +4,8 @@
 # VERSI DASHBOARD PROFESIONAL
 # =====================================================
 
+import io
+
 import numpy as np
 import pandas as pd
 import streamlit as st
@@ -12,109 +14,166 @@ import plotly.graph_objects as go
 # ---------------------------------------
 # FUNGSI VIKOR (VERSI DIPERBAIKI)
 # ---------------------------------------
-def vikor(decision_matrix, weights, criterion_types, v=0.5):
+def _vikor_core(matrix, weights, is_benefit, v):
     """
-    Implementasi Metode VIKOR yang benar
-    
+    Inti numerik VIKOR pada array float64 (tanpa pandas)
+
     Parameters:
-    - decision_matrix: matriks keputusan (m x n)
-    - weights: bobot kriteria (array of n)
-    - criterion_types: tipe kriteria ['benefit' atau 'cost']
-    - v: bobot strategi (default 0.5)
-    
+    - matrix: float64 C-contiguous (m x n)
+    - weights: float64 contiguous (n)
+    - is_benefit: bool contiguous (n)
+    - v: float
+
     Returns:
-    - DataFrame dengan kolom: Alternative, S, R, Q, Rank
+    - tuple (S, R, Q, f_star, f_minus)
     """
-    m, n = decision_matrix.shape
+    m = matrix.shape[0]
 
     # Step 1: Hitung nilai terbaik (f*) dan terburuk (f-)
-    f_star = np.zeros(n)
-    f_minus = np.zeros(n)
-
-    for j in range(n):
-        if criterion_types[j] == 'benefit':
-            f_star[j] = np.max(decision_matrix[:, j])
-            f_minus[j] = np.min(decision_matrix[:, j])
-        else:  # cost
-            f_star[j] = np.min(decision_matrix[:, j])
-            f_minus[j] = np.max(decision_matrix[:, j])
+    col_max = matrix.max(axis=0)
+    col_min = matrix.min(axis=0)
+    f_star = np.where(is_benefit, col_max, col_min)
+    f_minus = np.where(is_benefit, col_min, col_max)
 
     # Step 2: Hitung S(i) & R(i)
+    # Diproses per kriteria (n kecil) agar hanya vektor (m,) yang dialokasikan
+    denom = np.abs(f_star - f_minus)
     S = np.zeros(m)
-    R = np.zeros(m)
-
-    for i in range(m):
-        diff_list = []
-
-        for j in range(n):
-            # Hitung denominator (range)
-            denom = abs(f_star[j] - f_minus[j])
-            
-            if denom < 1e-9:
-                # Jika semua nilai sama, kontribusinya 0
-                normalized = 0
+    R = np.full(m, -np.inf)
+    d = np.empty(m)
+
+    # Nilai per kriteria sebagai skalar Python (float/bool) untuk pengecekan di loop
+    columns = zip(denom.tolist(), is_benefit.tolist(), f_star.tolist(), weights.tolist())
+    for j, (denom_j, benefit_j, f_star_j, weight_j) in enumerate(columns):
+        if denom_j < 1e-9:
+            # Jika semua nilai sama, kontribusinya 0
+            d.fill(0.0)
+        else:
+            # Hitung jarak dari solusi ideal, diskalakan bobot / range
+            if benefit_j:
+                np.subtract(f_star_j, matrix[:, j], out=d)
             else:
-                # Hitung jarak dari solusi ideal
-                if criterion_types[j] == 'benefit':
-                    distance = (f_star[j] - decision_matrix[i, j]) / denom
-                else:  # cost
-                    distance = (decision_matrix[i, j] - f_star[j]) / denom
-                
-                normalized = distance
-
-            diff_list.append(weights[j] * normalized)
+                np.subtract(matrix[:, j], f_star_j, out=d)
+            d *= weight_j / denom_j
 
-        S[i] = np.sum(diff_list)
-        R[i] = np.max(diff_list)
+        S += d
+        np.maximum(R, d, out=R)
 
     # Step 3: Hitung Q(i)
     S_star, S_minus = np.min(S), np.max(S)
     R_star, R_minus = np.min(R), np.max(R)
 
-    Q = np.zeros(m)
-    for i in range(m):
-        s_term = 0 if abs(S_minus - S_star) < 1e-9 else (S[i] - S_star) / (S_minus - S_star)
-        r_term = 0 if abs(R_minus - R_star) < 1e-9 else (R[i] - R_star) / (R_minus - R_star)
-        
-        Q[i] = v * s_term + (1 - v) * r_term
+    sr = S_minus - S_star
+    rr = R_minus - R_star
+    s_term = np.zeros(m) if abs(sr) < 1e-9 else (S - S_star) / sr
+    r_term = np.zeros(m) if abs(rr) < 1e-9 else (R - R_star) / rr
+
+    Q = v * s_term + (1 - v) * r_term
+
+    return S, R, Q, f_star, f_minus
 
-    # Step 4: Tabel hasil
+def vikor(decision_matrix, weights, criterion_types, v=0.5, alternatives=None):
+    """
+    Implementasi Metode VIKOR yang benar
+    
+    Parameters:
+    - decision_matrix: matriks keputusan (m x n)
+    - weights: bobot kriteria (array of n)
+    - criterion_types: tipe kriteria ['benefit' atau 'cost']
+    - v: bobot strategi (default 0.5)
+    - alternatives: nama alternatif (list of m, default A1..Am)
+    
+    Returns:
+    - DataFrame dengan kolom: Alternative, S, R, Q, Rank
+    """
+    m, n = decision_matrix.shape
+    if alternatives is None:
+        alternatives = [f"A{i+1}" for i in range(m)]
+    matrix = np.ascontiguousarray(decision_matrix, dtype=np.float64)
+    weights = np.ascontiguousarray(weights, dtype=np.float64)
+    # Mask boolean tipe kriteria, dihitung sekali (True = benefit, False = cost)
+    is_benefit = np.fromiter((t == 'benefit' for t in criterion_types), dtype=bool, count=n)
+
+    S, R, Q, f_star, f_minus = _vikor_core(matrix, weights, is_benefit, float(v))
+
+    # Ranking via argsort; nilai Q yang sama mendapat peringkat terkecil (method='min')
+    order = np.argsort(Q, kind='stable')
+    Q_sorted = Q[order]
+
+    # Step 4: Tabel hasil, langsung tersusun berdasarkan Q
     df = pd.DataFrame({
-        'Alternative': [f"A{i+1}" for i in range(m)],
-        'S': S,
-        'R': R,
-        'Q': Q
+        'Alternative': [alternatives[i] for i in order],
+        'S': S[order],
+        'R': R[order],
+        'Q': Q_sorted,
+        'Rank': np.searchsorted(Q_sorted, Q_sorted, side='left') + 1
     })
 
-    df['Rank'] = df['Q'].rank(method='min').astype(int)
-    df = df.sort_values(by='Q').reset_index(drop=True)
-
     return df, f_star, f_minus
 
+@st.cache_data
+def _vikor_cached(matrix_bytes, shape, weights_t, types_t, v, alternatives_t):
+    """Hasil vikor() di-cache berdasarkan input, agar input yang sama tidak dihitung ulang"""
+    matrix = np.frombuffer(matrix_bytes, dtype=np.float64).reshape(shape)
+    return vikor(matrix, np.array(weights_t), list(types_t), v, alternatives=list(alternatives_t))
+
 # ---------------------------------------
 # FUNGSI UNTUK MENYIMPAN & LOAD HISTORY
 # ---------------------------------------
 def load_history():
     """Load history dari session state"""
     if 'history' not in st.session_state:
+        # dict dipakai sebagai ordered set: urutan input terjaga, cek keanggotaan O(1)
         st.session_state.history = {
-            'alternatives': [],
-            'criteria': []
+            'alternatives': {},
+            'criteria': {}
         }
     return st.session_state.history
 
 def save_to_history(key, value):
     """Simpan nilai ke history"""
     history = load_history()
-    if value and value not in history[key]:
-        history[key].append(value)
+    entries = history[key]
+    if value and value not in entries:
+        entries[value] = None
         st.session_state.history = history
 
 # ---------------------------------------
-# CUSTOM CSS
+# FUNGSI VISUALISASI
 # ---------------------------------------
-def load_custom_css():
-    st.markdown("""
+@st.cache_data
+def _build_q_fig(alternatives, q_bytes):
+    """Grafik batang nilai Q, di-cache berdasarkan nama alternatif dan vektor Q"""
+    q = np.frombuffer(q_bytes, dtype=np.float64)
+    fig = go.Figure(data=[
+        go.Bar(
+            x=list(alternatives),
+            y=q,
+            marker=dict(
+                color=q,
+                colorscale='RdYlGn_r',
+                showscale=True,
+                colorbar=dict(title="Nilai Q")
+            ),
+            text=q.round(4),
+            textposition='outside'
+        )
+    ])
+    
+    fig.update_layout(
+        title="Perbandingan Nilai Q (Semakin Kecil Semakin Baik)",
+        xaxis_title="Alternatif",
+        yaxis_title="Nilai Q",
+        height=500,
+        template="plotly_white",
+        showlegend=False
+    )
+    return fig
+
+# ---------------------------------------
+# CUSTOM CSS & HTML STATIS
+# ---------------------------------------
+_CUSTOM_CSS = """
     <style>
         @import url('https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.0/font/bootstrap-icons.css');
         
@@ -324,31 +383,16 @@ def load_custom_css():
             padding-bottom: 2rem;
         }
     </style>
-    """, unsafe_allow_html=True)
-
-# ---------------------------------------
-# STREAMLIT UI
-# ---------------------------------------
-st.set_page_config(
-    page_title="Dashboard SPK VIKOR",
-    page_icon="💻",
-    layout="wide",
-    initial_sidebar_state="collapsed"
-)
+"""
 
-load_custom_css()
-history = load_history()
-
-# HEADER
-st.markdown("""
+_HEADER_HTML = """
 <div class="main-header">
     <h1>💻 Dashboard SPK VIKOR</h1>
     <p>Sistem Pendukung Keputusan Rekomendasi Laptop Terbaik untuk Mahasiswa Informatika</p>
 </div>
-""", unsafe_allow_html=True)
+"""
 
-# TEAM MEMBERS
-st.markdown("""
+_TEAM_HTML = """
 <div class="team-section">
     <div class="team-title">
         👥 Tim Pengembang
@@ -380,7 +424,42 @@ st.markdown("""
         </div>
     </div>
 </div>
-""", unsafe_allow_html=True)
+"""
+
+_FOOTER_HTML = """
+<div class="footer">
+    <h3 style="margin: 0;">Dibuat oleh Kelompok 1</h3>
+    <p style="margin: 0.5rem 0 0 0; opacity: 0.9;">Metode VIKOR | Sistem Pendukung Keputusan</p>
+    <p style="margin: 0.5rem 0 0 0; opacity: 0.7; font-size: 0.9rem;">Dashboard Professional Edition</p>
+</div>
+"""
+
+@st.cache_resource
+def _rendered_css():
+    """String CSS dibuat sekali dan dipakai ulang di setiap rerun"""
+    return _CUSTOM_CSS
+
+def load_custom_css():
+    st.markdown(_rendered_css(), unsafe_allow_html=True)
+
+# ---------------------------------------
+# STREAMLIT UI
+# ---------------------------------------
+st.set_page_config(
+    page_title="Dashboard SPK VIKOR",
+    page_icon="💻",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+load_custom_css()
+history = load_history()
+
+# HEADER
+st.markdown(_HEADER_HTML, unsafe_allow_html=True)
+
+# TEAM MEMBERS
+st.markdown(_TEAM_HTML, unsafe_allow_html=True)
 
 # INPUT DASAR
 st.markdown('<div class="card-title">⚙️ Pengaturan Dasar</div>', unsafe_allow_html=True)
@@ -399,17 +478,17 @@ if m and n:
         
         col_alt = st.columns(3)
         alternatives = []
+        alt_suggestion = (
+            f"Saran: {', '.join(list(history['alternatives'])[:3])}"
+            if history['alternatives'] else "Masukkan nama laptop"
+        )
         for i in range(int(m)):
             with col_alt[i % 3]:
-                suggestion_text = ""
-                if history['alternatives']:
-                    suggestion_text = f"Saran: {', '.join(history['alternatives'][:3])}"
-                
                 alt_input = st.text_input(
                     f"Alternatif {i+1}", 
                     value=f"A{i+1}", 
                     key=f"alt_{i}",
-                    help=suggestion_text if suggestion_text else "Masukkan nama laptop"
+                    help=alt_suggestion
                 )
                 alternatives.append(alt_input)
                 
@@ -423,21 +502,21 @@ if m and n:
         criteria = []
         weights = []
         criterion_types = []
+        crit_suggestion = (
+            f"Saran: {', '.join(list(history['criteria'])[:3])}"
+            if history['criteria'] else "Masukkan nama kriteria"
+        )
         
         for j in range(int(n)):
             st.markdown(f"**Kriteria {j+1}**")
             col_crit = st.columns([3, 2, 2])
             
             with col_crit[0]:
-                suggestion_text = ""
-                if history['criteria']:
-                    suggestion_text = f"Saran: {', '.join(history['criteria'][:3])}"
-                
                 crit_input = st.text_input(
                     "Nama Kriteria", 
                     value=f"C{j+1}", 
                     key=f"crit_{j}",
-                    help=suggestion_text if suggestion_text else "Masukkan nama kriteria",
+                    help=crit_suggestion,
                     label_visibility="collapsed"
                 )
                 criteria.append(crit_input)
@@ -467,24 +546,32 @@ if m and n:
         st.markdown('<div class="card-title">📊 Matriks Keputusan</div>', unsafe_allow_html=True)
         st.info("📝 Masukkan nilai untuk setiap alternatif dan kriteria")
         
-        data = []
-        for i in range(int(m)):
-            st.markdown(f"**{alternatives[i] if alternatives[i] else f'A{i+1}'}**")
-            cols = st.columns(int(n))
-            row = []
-            for j in range(int(n)):
-                with cols[j]:
-                    val = st.number_input(
-                        f"{criteria[j] if criteria[j] else f'C{j+1}'}", 
-                        step=0.01, 
-                        format="%.2f",
-                        key=f"val_{i}_{j}"
-                    )
-                    row.append(val)
-            data.append(row)
-            st.markdown("---")
+        # Label kolom/index posisional (A1.., C1..) agar identitas widget tidak
+        # berubah saat nama alternatif/kriteria diganti; nama asli hanya untuk tampilan
+        crit_keys = [f"C{j+1}" for j in range(int(n))]
+        template = pd.DataFrame(0.0, index=range(int(m)), columns=crit_keys)
+        template.insert(0, "Alternatif", [alt if alt else f"A{i+1}" for i, alt in enumerate(alternatives)])
+
+        column_config = {
+            "Alternatif": st.column_config.TextColumn("Alternatif", disabled=True)
+        }
+        for j, key in enumerate(crit_keys):
+            column_config[key] = st.column_config.NumberColumn(
+                label=criteria[j] if criteria[j] else key,
+                format="%.2f",
+                step=0.01
+            )
+
+        edited = st.data_editor(
+            template,
+            num_rows="fixed",
+            use_container_width=True,
+            hide_index=True,
+            key=f"matrix_{int(m)}_{int(n)}",
+            column_config=column_config
+        )
+        matrix = edited.iloc[:, 1:].fillna(0.0).to_numpy(dtype=np.float64)
         
-        matrix = np.array(data)
         st.markdown('</div>', unsafe_allow_html=True)
 
         st.markdown("<br>", unsafe_allow_html=True)
@@ -500,12 +587,18 @@ if m and n:
             if crit and crit not in [f"C{i+1}" for i in range(20)]:
                 save_to_history('criteria', crit)
         
-        weights_array = np.array(weights)
-        if np.sum(weights_array) > 0:
-            weights_array = weights_array / np.sum(weights_array)
-        
-        result, f_star, f_minus = vikor(matrix, weights_array, criterion_types, v=0.5)
-        result["Alternative"] = [alternatives[int(alt[1:])-1] for alt in result["Alternative"]]
+        w = np.asarray(weights, dtype=np.float64)
+        w_sum = w.sum()
+        weights_array = w / w_sum if w_sum > 0 else w
+        
+        result, f_star, f_minus = _vikor_cached(
+            np.ascontiguousarray(matrix, dtype=np.float64).tobytes(),
+            matrix.shape,
+            tuple(weights_array),
+            tuple(criterion_types),
+            0.5,
+            tuple(alternatives)
+        )
 
         st.success("✅ Perhitungan selesai!")
         
@@ -516,26 +609,30 @@ if m and n:
         ideal_df = pd.DataFrame({
             'Kriteria': criteria,
             'Tipe': criterion_types,
-            'f* (Ideal)': [f"{val:.4f}" for val in f_star],
-            'f- (Anti-Ideal)': [f"{val:.4f}" for val in f_minus],
-            'Bobot': [f"{val:.4f}" for val in weights_array]
+            'f* (Ideal)': f_star,
+            'f- (Anti-Ideal)': f_minus,
+            'Bobot': weights_array
         })
         
-        st.dataframe(ideal_df, use_container_width=True, hide_index=True)
+        st.dataframe(
+            ideal_df.style.format({'f* (Ideal)': '{:.4f}', 'f- (Anti-Ideal)': '{:.4f}', 'Bobot': '{:.4f}'}),
+            use_container_width=True,
+            hide_index=True
+        )
         st.markdown('</div>', unsafe_allow_html=True)
         
         # HASIL PERANKINGAN
         st.markdown('<div class="custom-card card-green">', unsafe_allow_html=True)
         st.markdown('<div class="card-title">🏆 Hasil Perankingan VIKOR</div>', unsafe_allow_html=True)
         
-        display_result = result.copy()
-        display_result['S'] = display_result['S'].round(4)
-        display_result['R'] = display_result['R'].round(4)
-        display_result['Q'] = display_result['Q'].round(4)
-        
-        st.dataframe(display_result, use_container_width=True, hide_index=True)
+        st.dataframe(
+            result.style.format({'S': '{:.4f}', 'R': '{:.4f}', 'Q': '{:.4f}'}),
+            use_container_width=True,
+            hide_index=True
+        )
 
         # REKOMENDASI TERBAIK
+        # result sudah tersusun berdasarkan argsort Q di vikor(), baris 0 = argmin Q
         best = result.iloc[0]
         st.markdown(f"""
         <div class="success-box">
@@ -554,35 +651,15 @@ if m and n:
         st.markdown('<div class="custom-card card-blue">', unsafe_allow_html=True)
         st.markdown('<div class="card-title">📊 Visualisasi Nilai Q</div>', unsafe_allow_html=True)
         
-        fig = go.Figure(data=[
-            go.Bar(
-                x=result['Alternative'],
-                y=result['Q'],
-                marker=dict(
-                    color=result['Q'],
-                    colorscale='RdYlGn_r',
-                    showscale=True,
-                    colorbar=dict(title="Nilai Q")
-                ),
-                text=result['Q'].round(4),
-                textposition='outside'
-            )
-        ])
-        
-        fig.update_layout(
-            title="Perbandingan Nilai Q (Semakin Kecil Semakin Baik)",
-            xaxis_title="Alternatif",
-            yaxis_title="Nilai Q",
-            height=500,
-            template="plotly_white",
-            showlegend=False
-        )
+        fig = _build_q_fig(tuple(result['Alternative']), result['Q'].to_numpy().tobytes())
         
         st.plotly_chart(fig, use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
 
         # DOWNLOAD
-        csv = result.to_csv(index=False).encode('utf-8')
+        csv_buffer = io.BytesIO()
+        result.to_csv(csv_buffer, index=False, encoding='utf-8')
+        csv = csv_buffer.getvalue()
         st.download_button(
             label="📥 Download Hasil CSV",
             data=csv,
@@ -609,10 +686,4 @@ if m and n:
         st.markdown('</div>', unsafe_allow_html=True)
 
 # FOOTER
-st.markdown("""
-<div class="footer">
-    <h3 style="margin: 0;">Dibuat oleh Kelompok 1</h3>
-    <p style="margin: 0.5rem 0 0 0; opacity: 0.9;">Metode VIKOR | Sistem Pendukung Keputusan</p>
-    <p style="margin: 0.5rem 0 0 0; opacity: 0.7; font-size: 0.9rem;">Dashboard Professional Edition</p>
-</div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown(_FOOTER_HTML, unsafe_allow_html=True)